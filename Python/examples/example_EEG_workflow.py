@@ -32,7 +32,8 @@ Example : This example shows the functionality of the impedance plotter and the
 '''
 
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import time
 
 from PySide2 import QtWidgets
@@ -108,7 +109,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
@@ -32,9 +32,11 @@ Example : This example shows the functionality to display the output of an AUX
 '''
 
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from PySide2 import QtWidgets
+import numpy as np
 
 from TMSiSDK import tmsi_device
 from TMSiSDK import plotters
@@ -59,32 +61,31 @@ try:
     dev.config.set_sample_rate(ChannelType.BIP, 1)
     
     # Enable BIP 01, AUX 1-1, 1-2 and 1-3
-    AUX_list = [0,1,2]
-    BIP_list = [0]
+    AUX_SET = frozenset((0,1,2))
+    BIP_SET = frozenset((0,))
     
     # Retrieve all channels from the device and update which should be enabled
     ch_list = dev.config.channels
     
-    # The counters are used to keep track of the number of AUX and BIP channels 
-    # that have been encountered while looping over the channel list
-    AUX_count = 0
-    BIP_count = 0
-    for idx, ch in enumerate(ch_list):
-        if (ch.type == ChannelType.AUX):
-            if AUX_count in AUX_list:
-                ch.enabled = True
-            else:
-                ch.enabled = False
-            AUX_count += 1
-        elif (ch.type == ChannelType.BIP):
-            if BIP_count in BIP_list:
-                ch.enabled = True
-            else:
-                ch.enabled = False
-            BIP_count += 1
-        else :
-            ch.enabled = False
-    dev.config.channels = ch_list
+    # The cumulative sums keep track of the number of AUX and BIP channels 
+    # that have been encountered in the channel list
+    ch_types = np.fromiter((ch.type.value for ch in ch_list), dtype=np.int8, count=len(ch_list))
+    AUX_mask = (ch_types == ChannelType.AUX.value)
+    BIP_mask = (ch_types == ChannelType.BIP.value)
+    AUX_idx = np.cumsum(AUX_mask) - 1
+    BIP_idx = np.cumsum(BIP_mask) - 1
+    enabled = (AUX_mask & np.isin(AUX_idx, np.fromiter(AUX_SET, dtype=np.int32))) | \
+              (BIP_mask & np.isin(BIP_idx, np.fromiter(BIP_SET, dtype=np.int32)))
+    
+    # Only update the channels of which the state changes and only write the 
+    # channel list back to the device when at least one channel changed
+    changed = False
+    for ch, en in zip(ch_list, enabled.tolist()):
+        if ch.enabled != en:
+            ch.enabled = en
+            changed = True
+    if changed:
+        dev.config.channels = ch_list
     
     # Update sensor information
     dev.update_sensors()
@@ -121,7 +122,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
@@ -28,7 +28,8 @@ Example : This example shows the manipulation of the active channel list and
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
 from TMSiSDK import tmsi_device
@@ -106,18 +107,16 @@ try:
     #        not be disabled. The device will ignore such changes.
     
     # Enable the first 24 UNI channels, skipping CREF
-    UNI_list = list(range(1,25))
+    UNI_SET = frozenset(range(1,25))
+    UNI_TAG = ChannelType.UNI
     # The counter is used to keep track of the number of UNI channels that have
     # been encountered while looping over the channel list
     UNI_count = 0
 
     ch_list = dev.config.channels
     for idx, ch in enumerate(ch_list):
-        if (ch.type == ChannelType.UNI):
-            if UNI_count in UNI_list:
-                ch.enabled = True
-            else:
-                ch.enabled = False
+        if ch.type is UNI_TAG:
+            ch.enabled = (UNI_count in UNI_SET)
             # Update the UNI counter
             UNI_count += 1
     dev.config.channels = ch_list
@@ -133,7 +132,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
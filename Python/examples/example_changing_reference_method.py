@@ -29,7 +29,8 @@ Example : This example shows how to change the applied reference method.
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import time
 
@@ -101,7 +102,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
@@ -29,13 +29,25 @@ Example : This example shows how to change the Base Sample Rate property of
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
 from TMSiSDK import tmsi_device
 from TMSiSDK.device import DeviceInterfaceType, ChannelType, DeviceState
 from TMSiSDK.error import TMSiError, TMSiErrorCode, DeviceErrorLookupTable
 
+# Channel-type-groups of which the sample-rate can be reported
+PRINTABLE_CHANNEL_TYPES = tuple(t for t in ChannelType if t not in (ChannelType.unknown, ChannelType.all_types))
+
+def _snapshot_rates(dev):
+    """Retrieves the sample-rate of all printable channel-type-groups at once."""
+    return {t: dev.config.get_sample_rate(t) for t in PRINTABLE_CHANNEL_TYPES}
+
+def _print_rates(snap):
+    """Prints the snapshot of sample-rates with a single print-call."""
+    print('\n'.join(f'{t} = {hz} Hz' for t, hz in snap.items()))
+
 try:
     # Initialize the TMSi-SDK first before starting using it
     tmsi_device.initialize()
@@ -49,9 +61,7 @@ try:
     print('The current base-sample-rate is {0} Hz.'.format(dev.config.base_sample_rate))
     print('\nThe current sample-rates per channel-type-group are :')
 
-    for type in ChannelType:
-        if (type != ChannelType.unknown) and (type != ChannelType.all_types):
-            print('{0} = {1} Hz'.format(str(type), dev.config.get_sample_rate(type)))
+    _print_rates(_snapshot_rates(dev))
 
     # The sample-rate of the channel-type-groups are derivated from the base-sample-rate.
     # Changing the base-sample-rate will therefor also automatically change the
@@ -63,9 +73,7 @@ try:
     print('\n\nThe updated base-sample-rate is {0} Hz.'.format(dev.config.base_sample_rate))
     print('\nThe updated sample-rates per channel-type-group are :')
 
-    for type in ChannelType:
-        if (type != ChannelType.unknown) and (type != ChannelType.all_types):
-            print('{0} = {1} Hz'.format(str(type), dev.config.get_sample_rate(type)))
+    _print_rates(_snapshot_rates(dev))
 
     # It is also possible to change the sample-rate per channel-type-group individually.
     # The sample-rate is a derivate from the actual base-sample-rate. The sample-rate
@@ -90,9 +98,7 @@ try:
     print('\n\nThe base-sample-rate is still {0} Hz.'.format(dev.config.base_sample_rate))
     print('\nThe updated sample-rates per channel-type-group are now :')
 
-    for type in ChannelType:
-        if (type != ChannelType.unknown) and (type != ChannelType.all_types):
-            print('{0} = {1} Hz'.format(str(type), dev.config.get_sample_rate(type)))
+    _print_rates(_snapshot_rates(dev))
 
     # Close the connection to the SAGA-system
     dev.close()
@@ -101,7 +107,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
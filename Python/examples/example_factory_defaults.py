@@ -28,7 +28,8 @@ Example : This example shows how to initiate a factory reset of the SAGA
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from TMSiSDK import tmsi_device
 from TMSiSDK.device import DeviceInterfaceType, DeviceState
@@ -54,7 +55,7 @@ except TMSiError as e:
      print("!!! TMSiError !!! : ", e.code)
      if (e.code == TMSiErrorCode.device_error) :
          print("  => device error : ", hex(dev.status.error))
-         DeviceErrorLookupTable(hex(dev.status.error))
+         print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
@@ -31,7 +31,8 @@ Example : This example shows how to couple an additional signal processing objec
 '''
 
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from PySide2 import QtWidgets
 import numpy as np
@@ -59,24 +60,27 @@ try:
     dev.config.set_sample_rate(ChannelType.all_types, 8)
     
     # Enable UNI channels 1 to 24
-    UNI_list = np.arange(1,25)
+    UNI_SET = frozenset(range(1,25))
     
     # Retrieve all channels from the device and update which should be enabled
     ch_list = dev.config.channels
     
-    #Initialise counter per channel type
-    UNI_count = 0
+    # Determine per channel whether it is a UNI channel and, if so, its index 
+    # within the UNI channels. Only the selected UNI channels are enabled.
+    ch_types = np.fromiter((ch.type.value for ch in ch_list), dtype=np.int8, count=len(ch_list))
+    UNI_mask = (ch_types == ChannelType.UNI.value)
+    UNI_idx = np.cumsum(UNI_mask) - 1
+    enabled = UNI_mask & np.isin(UNI_idx, np.fromiter(UNI_SET, dtype=np.int32))
    
-    for idx, ch in enumerate(ch_list):
-        if (ch.type == ChannelType.UNI):
-            if UNI_count in UNI_list:
-                ch.enabled = True
-            else:
-                ch.enabled = False
-            UNI_count += 1
-        else :
-            ch.enabled = False
-    dev.config.channels = ch_list
+    # Only update the channels of which the state changes and only write the 
+    # channel list back to the device when at least one channel changed
+    changed = False
+    for ch, en in zip(ch_list, enabled.tolist()):
+        if ch.enabled != en:
+            ch.enabled = en
+            changed = True
+    if changed:
+        dev.config.channels = ch_list
     
     # Initialise a file-writer class (Poly5-format) and state its file path
     file_writer = FileWriter(FileFormat.poly5, "./measurements/example_filter_and_plot.poly5")
@@ -117,7 +121,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : 0x", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
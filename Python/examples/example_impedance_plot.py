@@ -28,7 +28,8 @@ Example : This example shows the functionality of the impedance plotter.
 '''
 
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from PySide2 import QtWidgets
 import numpy as np
@@ -51,25 +52,17 @@ try:
     
     # Enable UNI 01 to UNI 32
     ch_list = dev.config.channels
-    UNI_count = 0
-    UNI_list = np.arange(1,33, dtype = int)
-    for idx, ch in enumerate(ch_list):
-        if (ch.type == ChannelType.UNI):
-            if UNI_count in UNI_list:
-                ch.enabled = True
-            else:
-                ch.enabled = False
-            UNI_count += 1
-        else :
-            ch.enabled = False
+    ch_types = np.fromiter((ch.type.value for ch in ch_list), dtype=np.int8, count=len(ch_list))
+    # Positions of the UNI channels in the channel list (the first one is CREF)
+    UNI_pos = np.flatnonzero(ch_types == ChannelType.UNI.value)
+    mask = np.zeros(len(ch_list), dtype=bool)
+    mask[UNI_pos[1:33]] = True
+    for ch, en in zip(ch_list, mask.tolist()):
+        ch.enabled = en
     dev.config.channels = ch_list
     
-    # Check if there is already a plotter application in existence
-    plotter_app = QtWidgets.QApplication.instance()
-    
-    # Initialise the plotter application if there is no other plotter application
-    if not plotter_app:
-        plotter_app = QtWidgets.QApplication(sys.argv)
+    # Reuse the running Qt application (e.g. when run from a console), only create one when none exists yet
+    plotter_app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
 
     # Define the GUI object and show it (either a grid layout or head layout may be chosen)
     window = plotters.ImpedancePlot(figurename = 'An Impedance Plot', device = dev, layout = 'grid')
@@ -78,8 +71,9 @@ try:
     # Enter the event loop
     plotter_app.exec_()
     
-    # Delete the Impedace plotter application
-    del plotter_app
+    # The event loop has been quit by closing the plot. Process the remaining 
+    # events and keep the application alive for reuse
+    plotter_app.processEvents()
     
     # Close the connection to the SAGA device
     dev.close()
@@ -88,7 +82,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : 0x", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
@@ -28,7 +28,8 @@ Example : This example shows how to load/save several different configurations
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
 from TMSiSDK import tmsi_device
@@ -59,11 +60,8 @@ try:
     # Enable all UNI-channels, print the updated active channel list and save the new configuration to file
     print('\nActivate all UNI-channels : and save the configuration to the file [..\\configs\\saga_config_current.xml]')
     ch_list = dev.config.channels
-    for idx, ch in enumerate(ch_list):
-        if (ch.type == ChannelType.UNI):
-            ch.enabled = True
-        else :
-            ch.enabled = False
+    for ch in ch_list:
+        ch.enabled = (ch.type == ChannelType.UNI)
     dev.config.channels = ch_list
     for idx, ch in enumerate(dev.channels):
          print('[{0}] : [{1}] in [{2}]'.format(idx, ch.name, ch.unit_name))
@@ -78,7 +76,7 @@ except TMSiError as e:
     print("!!! TMSiError !!! : ", e.code)
     if (e.code == TMSiErrorCode.device_error) :
         print("  => device error : ", hex(dev.status.error))
-        DeviceErrorLookupTable(hex(dev.status.error))
+        print('\n ' + DeviceErrorLookupTable(dev.status.error) + '\n')
         
 finally:
     # Close the connection to the device when the device is opened
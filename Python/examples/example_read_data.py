@@ -27,7 +27,8 @@ Example : This example shows how to read data from a Poly5-file.
 
 '''
 import sys
-sys.path.append("../")
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from TMSiSDK.file_readers import Poly5Reader
 
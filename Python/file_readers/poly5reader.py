@@ -27,14 +27,53 @@ TMSiSDK: Poly5 File Reader
 
 '''
 import numpy as np
+import os
 import struct
 import datetime
-import tkinter as tk
-from tkinter import filedialog
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+# Layout of the file header and of a single channel description
+_HEADER = struct.Struct("=31sH81phhBHi4xHHHHHHHiHHH64x")
+_CHANNEL = struct.Struct("=41p4x11pffffH62x")
+
+# Sample data larger than this is copied out of the data blocks by multiple threads
+_PARALLEL_COPY_SIZE = 64 * 1024**2
+_NUM_WORKERS = min(4, os.cpu_count() or 1)
+
+def _copy_blocks(dst, src):
+    """Copies the data blocks in src into dst. For large recordings the copy
+        is split along the first axis over a number of threads; NumPy releases 
+        the GIL while copying, so the parts are copied concurrently.
+    """
+    if src.nbytes < _PARALLEL_COPY_SIZE or _NUM_WORKERS == 1:
+        np.copyto(dst, src)
+        return
+    bounds = np.linspace(0, len(src), _NUM_WORKERS + 1, dtype=int)
+    with ThreadPoolExecutor(_NUM_WORKERS) as pool:
+        list(pool.map(lambda i: np.copyto(dst[bounds[i]:bounds[i+1]], src[bounds[i]:bounds[i+1]]), 
+                      range(_NUM_WORKERS)))
 
 class Poly5Reader: 
+    """ 'Poly5Reader' reads the sample data of a Poly5 file. It has the next properties:
+
+        channels : 'list Channel' The channels stored in the file.
+
+        sample_rate : 'int' The sample rate of the stored channels.
+
+        num_samples : 'int' The number of samples per channel.
+
+        samples : 'ndarray' The sample data as [channels x samples]. The samples 
+                  are kept as float32, the data type in which they are stored 
+                  in the file. Cast once (e.g. samples.astype(np.float64)) 
+                  when a higher precision is required.
+    """
     def __init__(self, filename=None):
         if filename==None:
+            # Tk is only needed to select the file, so it is imported here
+            import tkinter as tk
+            from tkinter import filedialog
+            
             root = tk.Tk()
 
             filename = filedialog.askopenfilename()
@@ -47,33 +86,51 @@ class Poly5Reader:
     def _readFile(self, filename):
         try:
             f = open(filename, "rb")
+        except OSError as e:
+            print('Could not open file. ', e)
+            return
+            
+        with f:
+            # The file is read from start to end, let the OS read ahead (not available on Windows)
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
             try:    
                 self._readHeader(f)
                 self.channels=self._readSignalDescription(f)
                 
-                sample_buffer=np.zeros(self.num_channels*self.num_samples)
- 
-                for i in range(self.num_data_blocks):
-                    print('\rProgress: % 0.1f %%' %(100*i/self.num_data_blocks), end="\r")
-                    i_start=i*self.num_data_blocks+1;
-                    i_end=min((i+1)*self.num_data_blocks, self.num_samples)
-                    data_block=self._readSignalBlock(f, i_end - i_start + 1)
-                    i1=i*self.num_samples_per_block*self.num_channels
-                    i2=(i+1)*self.num_samples_per_block*self.num_channels
-                    np.put(sample_buffer, range(i1, i2),data_block)
+                # Samples are stored per block, sample after sample, with all 
+                # channels of a sample next to each other. The block headers 
+                # contain no sample data, so all full blocks are read in one pass.
+                block_type=np.dtype([('header', 'V86'), 
+                                     ('data', '<f4', (self.num_samples_per_block, self.num_channels))])
+                total_samples=min(self.num_samples, self.num_data_blocks*self.num_samples_per_block)
+                num_full_blocks=total_samples//self.num_samples_per_block
+                blocks=np.empty(num_full_blocks, dtype=block_type)
+                self._readInto(f, blocks)
+                
+                # The samples are written directly in the final [channels x samples]
+                # layout, so that the data of a single channel is contiguous
+                sample_buffer=np.empty((self.num_channels, total_samples), dtype=np.float32)
+                i_tail=num_full_blocks*self.num_samples_per_block
+                _copy_blocks(np.reshape(sample_buffer[:, :i_tail], [self.num_channels, num_full_blocks, self.num_samples_per_block]), 
+                             np.transpose(blocks['data'], [2, 0, 1]))
+                
+                # The final block is only partially filled when the number of 
+                # samples is not a multiple of the block size
+                if total_samples > i_tail:
+                    f.seek(86, 1)
+                    tail=np.empty((total_samples - i_tail, self.num_channels), dtype='<f4')
+                    self._readInto(f, tail)
+                    sample_buffer[:, i_tail:]=tail.T
                    
-                samples=np.transpose(np.reshape(sample_buffer, [self.num_samples_per_block*(i+1), self.num_channels]))
-                self.samples=samples
+                self.samples=sample_buffer
                 print('Done reading data.')
-                f.close()
-            except:
-                print('Reading data failed.')
-        except:
-            print('Could not open file. ')
+            except (OSError, EOFError, ValueError, struct.error) as e:
+                print('Reading data failed. ', e)
         
             
     def _readHeader(self, f):
-        header_data=struct.unpack("=31sH81phhBHi4xHHHHHHHiHHH64x", f.read(217))
+        header_data=_HEADER.unpack(f.read(_HEADER.size))
         magic_number=str(header_data[0])
         version_number=header_data[1]
         self.sample_rate=header_data[3]
@@ -93,28 +150,27 @@ class Poly5Reader:
             print('\t Sample rate: %s Hz' %self.sample_rate)
             
             
+    def _readInto(self, f, buffer):
+        # Read the file contents straight into the memory of the array
+        view=memoryview(buffer).cast('B')
+        if f.readinto(view) != view.nbytes:
+            raise EOFError('Unexpected end of file.')
+            
     def _readSignalDescription(self, f): 
+        # Every channel is described twice in the file, by a '(Lo)' and a '(Hi)' 
+        # description of 136 bytes each. The complete table is read at once 
+        # and only the first description of each channel is used.
+        descriptions=f.read(2*_CHANNEL.size*self.num_channels)
         chan_list = []
-        for ch in range(self.num_channels):
-            channel_description=struct.unpack("=41p4x11pffffH62x", f.read(136))
+        for channel_description in islice(_CHANNEL.iter_unpack(descriptions), 0, None, 2):
             name = channel_description[0][5:].decode('ascii')
             unit_name=channel_description[1].decode('utf-8')
             ch = Channel(name, unit_name)
             chan_list.append(ch)
-            f.read(136)
         return chan_list
         
             
     
-    def _readSignalBlock(self, f, n):
-        f.read(86)
-        buffer_size=self.num_channels*self.num_samples_per_block
-        sampleData=f.read(buffer_size*4)
-        DataBlock=struct.unpack((str(buffer_size) + 'f'), sampleData)
-        SignalBlock=np.asarray(DataBlock)
-        return SignalBlock
-        
-
 class Channel:
     """ 'Channel' represents a device channel. It has the next properties:
 
@@ -123,9 +179,21 @@ class Channel:
         unit_name : 'string' The name of the unit (e.g. 'μVolt)  of the sample-data of the channel.
     """
 
+    __slots__ = ('__name', '__unit_name')
+
     def __init__(self, name, unit_name):
         self.__unit_name = unit_name
         self.__name = name
+
+    @property
+    def name(self):
+        """'string' The name of the channel."""
+        return self.__name
+
+    @property
+    def unit_name(self):
+        """'string' The name of the unit (e.g. 'μVolt)  of the sample-data of the channel."""
+        return self.__unit_name
         
         
         
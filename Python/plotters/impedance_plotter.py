@@ -30,36 +30,119 @@ TMSiSDK: Plotter object that displays impedance values in real-time
 from PySide2 import QtGui, QtCore, QtWidgets
 import numpy as np
 import pyqtgraph as pg
-import time
 import queue
-import pandas as pd
 import math
+import html
+import importlib.util
 
 import sys
 sys.path.append("../TMSiSDK")
 
 import tmsi_device
 import sample_data_server
-import sample_data
 
 from device import DeviceInterfaceType, MeasurementType
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Legend entries and the colors used to code the impedance values
+_LEGEND = (('0 - 5 k\u03A9', (0, 255, 0)),
+           ('5 - 10 k\u03A9', (0, 204, 0)),
+           ('10 - 30 k\u03A9', (0, 153, 0)),
+           ('30 - 50 k\u03A9', (0, 102, 0)),
+           ('50 - 100 k\u03A9', (255, 255, 0)),
+           ('100 - 200 k\u03A9', (204, 128, 0)),
+           ('200 - 400 k\u03A9', (255, 0, 0)),
+           ('400 - 500 k\u03A9', (153, 0, 0)),
+           ('≥ 500 k\u03A9 / Not connected', (102, 66, 33)),
+           ('Disabled', (128, 128, 128)),
+           ('Odd/Even error', (204, 0, 102)),
+           ('PGND disconnected', (0, 0, 179)))
+
+# Upper bounds (exclusive) of the impedance ranges, in kΩ. Values of 500 and
+# higher fall into the last range
+_IMPEDANCE_EDGES = np.array([5, 10, 30, 50, 100, 200, 400, 500], dtype = np.int32)
+
+# Special values reported by the device and the index of their color
+_SENTINEL_VALUES = np.array([5000, 5100, 5200], dtype = np.int32)
+_SENTINEL_IDX = np.array([9, 10, 11], dtype = np.intp)
+
+
+def _precompute_head():
+    """ Computes the outline of the head, nose and (right) ear that are drawn
+        in the head layout
+    """
+    theta = np.arange(0, 2.02*math.pi, math.pi/50)
+    x_circle = (0.5*np.cos(theta)).astype(np.float32)
+    y_circle = (0.5*np.sin(theta)).astype(np.float32)
+    
+    y_nose = np.array([x_circle[2], 0.55, x_circle[-3]], dtype = np.float32)
+    x_nose = np.array([y_circle[2], 0, y_circle[-3]], dtype = np.float32)
+    
+    x_ears = np.array([0.49,  0.51,  0.52,  0.53, 0.54, 0.54, 0.55, 0.53, 0.51, 0.485], dtype = np.float32)
+    y_ears = np.array([0.10, 0.1175, 0.1185, 0.1145, 0.0955, -0.0055, -0.0930, -0.1315, -0.1385, -0.12], dtype = np.float32)
+    return x_circle, y_circle, x_nose, y_nose, x_ears, y_ears
+
+# Static artwork of the head layout, shared by all plots
+_HEAD_X, _HEAD_Y, _NOSE_X, _NOSE_Y, _EARS_X, _EARS_Y = _precompute_head()
+
+
+def _bucketize_numpy(values, edges, sentinel_values, sentinel_idx, out):
+    """ Converts the impedance values to the index of their color coding, 
+        the result is written to out
+    """
+    out[:] = np.searchsorted(edges, values, side = 'right')
+    for value, idx in zip(sentinel_values, sentinel_idx):
+        out[values == value] = idx
+
+
+if HAS_NUMBA:
+    @njit(cache = True)
+    def _bucketize(values, edges, sentinel_values, sentinel_idx, out):
+        for i in range(values.shape[0]):
+            value = values[i]
+            idx = -1
+            for j in range(sentinel_values.shape[0]):
+                if value == sentinel_values[j]:
+                    idx = sentinel_idx[j]
+            if idx < 0:
+                idx = 0
+                while idx < edges.shape[0] and value >= edges[idx]:
+                    idx += 1
+            out[i] = idx
+else:
+    _bucketize = _bucketize_numpy
 
 class ImpedancePlot(pg.GraphicsLayoutWidget):
     """ Class that creates a GUI to display the impedance values in a gridded
         layout.
     """
-    def __init__(self, figurename, device, layout ='normal', file_storage = None):
-        """ Setting up the GUI's elements
+    def __init__(self, figurename, device, layout ='normal', file_storage = None, use_opengl = False):
+        """ Setting up the GUI's elements. When use_opengl is set and PyOpenGL
+            is available, the plot is rendered through OpenGL.
         """
         pg.GraphicsLayoutWidget.__init__(self)
-        pg.setConfigOptions(antialias = True)
+        
+        if use_opengl:
+            if importlib.util.find_spec('OpenGL') is not None:
+                self.useOpenGL(True)
+            else:
+                print('PyOpenGL is not available, falling back to the default renderer')
         
         # Set the minimum size of the GUI so that it can be plotted onto the screen nicely
         self.setMinimumSize(1500, 900)
         
         # Pass the device handle to the GUI
         self.device = device
+        
+        # Create the brushes for the color coding once, so that they can be reused every update
+        self._brush_table = np.empty(len(_LEGEND), dtype = object)
+        self._brush_table[:] = [QtGui.QBrush(QtGui.QColor(*color)) for _, color in _LEGEND]
+        
         # Update the title of the Impedance plot
         self.setWindowTitle(figurename)    
         
@@ -123,59 +206,54 @@ class ImpedancePlot(pg.GraphicsLayoutWidget):
         self.vb_legend.setMouseEnabled(x = False, y = False)
         self.vb_list.setMouseEnabled(x = False, y = False)
         
-        # Initialise the standard format for the different indicators
-        self.spots = [{'pos': (0,0), 'size': 20, 'pen': 'k', 'brush': QtGui.QBrush(QtGui.QColor(128, 128, 128))} \
-                      for i in range(len(self.device.imp_channels))]
+        # Initialise the standard format for the different indicators. The 
+        # positions and brushes are kept in separate arrays (one entry per indicator)
+        num_spots = len(self.device.imp_channels)
+        self._spot_pos = np.zeros((num_spots, 2))
+        self._spot_brush = np.empty(num_spots, dtype=object)
+        self._spot_brush[:] = self._brush_table[9]
+        self._color_idx = np.empty(num_spots, dtype = np.intp)
             
         if layout=='head':
             #read channel locations
-            chLocs=pd.read_csv('EEGchannelsTMSi.txt', sep="\t", header=None)       
-            chLocs.columns=['name', 'radius', 'theta']
+            ch_radius, ch_theta = np.loadtxt('EEGchannelsTMSi.txt', delimiter='\t', usecols=(1, 2), 
+                                             dtype=np.float32, unpack=True)
+            
+            # The static outline is antialiased, the global setting is left untouched
+            head_pen = pg.mkPen((165, 165, 165), width=5, cosmetic=True)
             
             #Plot a circle
-            theta=np.arange(0, 2.02*math.pi, math.pi/50)
-            x_circle = 0.5*np.cos(theta)
-            y_circle = 0.5*np.sin(theta)
-            self.h=pg.PlotCurveItem()
-            self.h.setData(x_circle, y_circle, pen=pg.mkPen((165, 165, 165), width=5))
+            self.h=pg.PlotCurveItem(antialias=True)
+            self.h.setData(_HEAD_X, _HEAD_Y, pen=head_pen)
             self.window.addItem(self.h) 
             
             #Plot a nose
-            y_nose=np.array([x_circle[2], 0.55, x_circle[-3]])
-            x_nose=np.array([y_circle[2], 0, y_circle[-3]])
-            self.n=pg.PlotCurveItem()
-            self.n.setData(x_nose, y_nose, pen=pg.mkPen((165, 165, 165), width=5))
+            self.n=pg.PlotCurveItem(antialias=True)
+            self.n.setData(_NOSE_X, _NOSE_Y, pen=head_pen)
             self.window.addItem(self.n)
             
             #Plot ears
-            x_ears=np.array([0.49,  0.51,  0.52,  0.53, 0.54, 0.54, 0.55, 0.53, 0.51, 0.485])
-            y_ears=np.array([0.10, 0.1175, 0.1185, 0.1145, 0.0955, -0.0055, -0.0930, -0.1315, -0.1385, -0.12])
-            self.e=pg.PlotCurveItem()
-            self.e.setData(x_ears, y_ears, pen=pg.mkPen((165, 165, 165), width=5))
+            self.e=pg.PlotCurveItem(antialias=True)
+            self.e.setData(_EARS_X, _EARS_Y, pen=head_pen)
             self.window.addItem(self.e)
-            self.e=pg.PlotCurveItem()
-            self.e.setData(-x_ears, y_ears, pen=pg.mkPen((165, 165, 165), width=5))
+            self.e=pg.PlotCurveItem(antialias=True)
+            self.e.setData(-_EARS_X, _EARS_Y, pen=head_pen)
             self.window.addItem(self.e)
             
-            # Initialise the standard format for the different indicators
-            self.spots = [{'pos': (0,0), 'size': 20, 'pen': 'k', 'brush': QtGui.QBrush(QtGui.QColor(128, 128, 128))} \
-                          for i in range(len(self.device.imp_channels))]
-    
-            # Set the position for each indicator
+            # Set the position for each indicator; the first and last channel
+            # are placed below the head, the others at their electrode location
+            num_eeg = num_spots - 2
+            theta_rad = np.deg2rad(ch_theta[:num_eeg])
+            self._spot_pos[0] = (-0.05, -0.6)
+            self._spot_pos[-1] = (0.05, -0.6)
+            self._spot_pos[1:-1, 0] = ch_radius[:num_eeg] * np.sin(theta_rad)
+            self._spot_pos[1:-1, 1] = ch_radius[:num_eeg] * np.cos(theta_rad)
+            
             for i in range(len(self.device.imp_channels)):
-                if i == 0:
-                    self.spots[i]['pos'] = (-0.05, -0.6)
-                elif i == len(self.device.imp_channels)-1:
-                    self.spots[i]['pos'] = (0.05, -0.6)
-                else:
-                      x=chLocs['radius'].values[i-1]*np.sin(np.deg2rad(chLocs['theta'].values[i-1]))
-                      y=chLocs['radius'].values[i-1]*np.cos(np.deg2rad(chLocs['theta'].values[i-1]))                               
-                      self.spots[i]['pos'] = (x,y)
-                    
                 # Place the name of each channel below the respective indicator
                 text = f'{self.device.imp_channels[i].name: ^10}'
                 t_item = pg.TextItem(text, (0, 0, 0), anchor=(0, 0))
-                t_item.setPos(self.spots[i]['pos'][0] -.03, self.spots[i]['pos'][1] - .02)
+                t_item.setPos(self._spot_pos[i, 0] -.03, self._spot_pos[i, 1] - .02)
                 self.window.addItem(t_item)
         else: 
             row_count = -1
@@ -183,107 +261,85 @@ class ImpedancePlot(pg.GraphicsLayoutWidget):
             # Set the position for each indicator
             for i in range(len(self.device.imp_channels)):
                 if i == 0:
-                    self.spots[i]['pos'] = (3, 8)
+                    self._spot_pos[i] = (3, 8)
                 elif i == len(self.device.imp_channels)-1:
-                    self.spots[i]['pos'] = (4, 8)
+                    self._spot_pos[i] = (4, 8)
                 elif (i-1) % 8 == 0:
                     row_count += 1
-                    self.spots[i]['pos'] = (((i-1)%8), row_count)
+                    self._spot_pos[i] = (((i-1)%8), row_count)
                 else:
-                    self.spots[i]['pos'] = (((i-1)%8), row_count)
+                    self._spot_pos[i] = (((i-1)%8), row_count)
                     
                 # Place the name of each channel below the respective indicator
                 text = f'{self.device.imp_channels[i].name: ^10}'
                 t_item = pg.TextItem(text, (128, 128, 128), anchor=(0, 0))
-                t_item.setPos(self.spots[i]['pos'][0] -.25, self.spots[i]['pos'][1] + .1)
+                t_item.setPos(self._spot_pos[i, 0] -.25, self._spot_pos[i, 1] + .1)
                 self.window.addItem(t_item)
          
                 
-        # Add all indicators to the plot
-        self.c = pg.ScatterPlotItem(self.spots)
+        # Add all indicators to the plot. The indicators are drawn without 
+        # antialiasing and from a cached symbol pixmap, as they are redrawn every update
+        self.c = pg.ScatterPlotItem(pos = self._spot_pos, size = 20, pen = 'k', brush = self._spot_brush,
+                                    antialias = False, useCache = True, pxMode = True)
         self.window.addItem(self.c)        
         
-        # Create a list with impedance values to display next to the plot
-        self.text_items = []
-        for i in range(len(self.device.imp_channels)): 
-            # Display 33 names per list (66 impedance channels in SAGA64+)
-            list_split_idx = 33
-            num_column = np.floor(i/list_split_idx)
-            value = 5000
-            text = f'{self.device.imp_channels[i].name}\t{value:>4}\t{self.device.imp_channels[i].unit_name}'            
-            t_item = pg.TextItem(text, (0, 0, 0), anchor = (-num_column *1.2,-i + list_split_idx * np.floor(i/list_split_idx)))
-            self.text_items.append(t_item)
-            self.vb_list.addItem(t_item)
+        # Create a list with impedance values to display next to the plot. The
+        # list is a single HTML table, so that it is laid out in one pass
+        self._prefix = [f'<td>{html.escape(ch.name)}</td><td align="right">' for ch in self.device.imp_channels]
+        self._suffix = [f'</td><td>{html.escape(ch.unit_name)}</td>' for ch in self.device.imp_channels]
+        self._value_text = ['5000'] * len(self.device.imp_channels)
+        self._last_values = np.full(len(self.device.imp_channels), -1, dtype = np.int32)
+        self._last_data_bytes = None
+        
+        # Display 33 names per column (66 impedance channels in SAGA64+)
+        list_split_idx = 33
+        self._list_rows = [range(row, len(self.device.imp_channels), list_split_idx) 
+                           for row in range(min(list_split_idx, len(self.device.imp_channels)))]
+        
+        self.list_item = pg.TextItem(anchor = (0, 0))
+        self.list_item.setHtml(self._list_html())
+        self.vb_list.addItem(self.list_item)
             
+    def _list_html(self):
+        """ Method that builds the HTML table with the listed impedance values
+        """
+        rows = ['<tr>' + '<td width="20"></td>'.join(self._prefix[i] + self._value_text[i] + self._suffix[i] for i in row) + '</tr>' 
+                for row in self._list_rows]
+        return '<table style="color: black" cellspacing="0" cellpadding="2">' + ''.join(rows) + '</table>'
         
-    @QtCore.Slot(object)
+    @QtCore.Slot(np.ndarray)
     def update_plot(self, data):
         """ Method that updates the indicators according to the measured impedance values
         """
-        for i in range(len(self.spots)):
-            self.spots[i]['brush'] = QtGui.QBrush(self._lookup_table(data[i]))
-            text = f"{self.device.imp_channels[i].name}\t{data[i]:>4}\t{self.device.imp_channels[i].unit_name}"            
-            self.text_items[i].setText(text)
-        self.c.setData(self.spots)
+        values = np.asarray(data, dtype = np.int32)
+        
+        # Nothing to redraw when the values are identical to the previous update
+        values_bytes = values.tobytes()
+        if values_bytes == self._last_data_bytes:
+            return
+        self._last_data_bytes = values_bytes
+        
+        # Convert the impedances to the index of the color coding
+        _bucketize(values, _IMPEDANCE_EDGES, _SENTINEL_VALUES, _SENTINEL_IDX, self._color_idx)
+        np.take(self._brush_table, self._color_idx, out = self._spot_brush)
+        
+        # Only update the listed values that changed since the previous update
+        changed = np.flatnonzero(values != self._last_values)
+        if changed.size:
+            for i in changed:
+                self._value_text[i] = str(values[i])
+            self._last_values[changed] = values[changed]
+            self.list_item.setHtml(self._list_html())
+        
+        # The positions never change, so only the brushes of the indicators are updated
+        self.c.setBrush(self._spot_brush)
         
                 
-    def _lookup_table(self, value):
-        """Look up table to convert impedances to color coding"""
-        if value < 5:
-            color_code = QtGui.QColor(0, 255, 0)
-        elif value >= 5 and value < 10:
-            color_code = QtGui.QColor(0, 204, 0)
-        elif value >= 10 and value < 30:
-            color_code = QtGui.QColor(0, 153, 0)
-        elif value >= 30 and value < 50:
-            color_code = QtGui.QColor(0, 102, 0)
-        elif value >= 50 and value < 100:
-            color_code = QtGui.QColor(255, 255, 0)
-        elif value >= 100 and value < 200:
-            color_code = QtGui.QColor(204, 128, 0)
-        elif value >= 200 and value < 400:
-            color_code = QtGui.QColor(255, 0, 0)
-        elif value >= 400 and value < 500:
-            color_code = QtGui.QColor(153, 0, 0)
-        elif value == 500:
-            color_code = QtGui.QColor(102, 66, 33)
-        elif value == 5000:
-            color_code = QtGui.QColor(128, 128, 128)
-        elif value == 5100:
-            color_code = QtGui.QColor(204, 0, 102)
-        elif value == 5200:
-            color_code = QtGui.QColor(0, 0, 179)
-        return color_code
-    
     def _generate_legend(self):
         """ Method that generates the dummy samples needed to plot the legend
         """
-        legend_spots = [{'pos': (0,0), 'size': 10, 'pen': 'k', 'brush': QtGui.QBrush() , 'name': ''} for i in range(12)]
-        legend_spots[0]['name'] = '0 - 5 k\u03A9'
-        legend_spots[0]['brush'] = QtGui.QBrush(QtGui.QColor(0, 255, 0))
-        legend_spots[1]['name'] = '5 - 10 k\u03A9'
-        legend_spots[1]['brush'] = QtGui.QBrush(QtGui.QColor(0, 204, 0))
-        legend_spots[2]['name'] = '10 - 30 k\u03A9'
-        legend_spots[2]['brush'] = QtGui.QBrush(QtGui.QColor(0, 153, 0))
-        legend_spots[3]['name'] = '30 - 50 k\u03A9'
-        legend_spots[3]['brush'] = QtGui.QBrush(QtGui.QColor(0, 102, 0))
-        legend_spots[4]['name'] = '50 - 100 k\u03A9'
-        legend_spots[4]['brush'] = QtGui.QBrush(QtGui.QColor(255, 255, 0))
-        legend_spots[5]['name'] = '100 - 200 k\u03A9'
-        legend_spots[5]['brush'] = QtGui.QBrush(QtGui.QColor(204, 128, 0))
-        legend_spots[6]['name'] = '200 - 400 k\u03A9'
-        legend_spots[6]['brush'] = QtGui.QBrush(QtGui.QColor(255, 0, 0))
-        legend_spots[7]['name'] = '400 - 500 k\u03A9'
-        legend_spots[7]['brush'] = QtGui.QBrush(QtGui.QColor(153, 0, 0))
-        legend_spots[8]['name'] = '≥ 500 k\u03A9 / Not connected'
-        legend_spots[8]['brush'] = QtGui.QBrush(QtGui.QColor(102, 66, 33))
-        legend_spots[9]['name'] = 'Disabled'
-        legend_spots[9]['brush'] = QtGui.QBrush(QtGui.QColor(128, 128, 128))
-        legend_spots[10]['name'] = 'Odd/Even error'
-        legend_spots[10]['brush'] = QtGui.QBrush(QtGui.QColor(204, 0, 102))
-        legend_spots[11]['name'] = 'PGND disconnected'
-        legend_spots[11]['brush'] = QtGui.QBrush(QtGui.QColor(0, 0, 179))
-        return legend_spots
+        return [{'pos': (0,0), 'size': 10, 'pen': 'k', 'brush': self._brush_table[i], 'name': name} 
+                for i, (name, _) in enumerate(_LEGEND)]
 
     def setupThread(self):
         """ Method that initialises the sampling thread of the device
@@ -296,13 +352,38 @@ class ImpedancePlot(pg.GraphicsLayoutWidget):
         # Move the worker to a Thread
         self.worker.moveToThread(self.thread)
         
+        # Latch the most recent impedance values and redraw at most ~30 times
+        # per second, so that bursts of incoming data result in a single repaint
+        self._pending_data = None
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(33)
+        self._update_timer.timeout.connect(self._flush_update)
+        
         # Connect signals to slots
         self.thread.started.connect(self.worker.update_samples)
-        self.worker.output.connect(self.update_plot)
+        self.worker.output.connect(self._schedule_update)
         
         # Start the thread
         self.thread.start()        
 
+    @QtCore.Slot(np.ndarray)
+    def _schedule_update(self, data):
+        """ Method that stores the latest impedance values and schedules a 
+            redraw of the plot, if one is not pending already
+        """
+        self._pending_data = data
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+    
+    @QtCore.Slot()
+    def _flush_update(self):
+        """ Method that draws the latest stored impedance values
+        """
+        data, self._pending_data = self._pending_data, None
+        if data is not None:
+            self.update_plot(data)
+
     def closeEvent(self,event):
         """ Method that redefines the default close event of the GUI. This is
             needed to close the sampling thread when the figure is closed.
@@ -319,8 +400,8 @@ class ImpedancePlot(pg.GraphicsLayoutWidget):
 class SamplingThread(QtCore.QObject):
     """ Class responsible for sampling the data from the device
     """
-    # Initialise the ouptut object
-    output = QtCore.Signal(object)
+    # Initialise the ouptut object (int32 array with the impedance values)
+    output = QtCore.Signal(np.ndarray)
     def __init__(self, main_class):
         QtCore.QObject.__init__(self)
         # Access initialised values from the GUI class
@@ -342,22 +423,27 @@ class SamplingThread(QtCore.QObject):
             gives the impedance value as output
         """
         while self.sampling:
-            while not self.q_sample_sets.empty():
-                sd = self.q_sample_sets.get()
+            # Wait for new data, but return regularly to check whether sampling was stopped
+            try:
+                sd = self.q_sample_sets.get(timeout = 0.05)
+            except queue.Empty:
+                continue
+            
+            # Drain the queue; only the most recent impedance values are of interest
+            while True:
                 self.q_sample_sets.task_done()
-                
-                # Retrieve the data from the queue and write it to a SampleSet object
-                for i in range(sd.num_sample_sets):
-                    sample_set = sample_data.SampleSet(sd.num_samples_per_sample_set, sd.samples[i*sd.num_samples_per_sample_set:(i+1)*sd.num_samples_per_sample_set])
+                try:
+                    sd = self.q_sample_sets.get_nowait()
+                except queue.Empty:
+                    break
             
-                # Use the final measured impedance value and convert to integer value
-                impedance_values = [int(x) for x in sample_set.samples]
+            # Use the final measured impedance values and convert to integer values
+            num_samples = sd.num_samples_per_sample_set
+            last_sample_set = sd.samples[(sd.num_sample_sets - 1) * num_samples : sd.num_sample_sets * num_samples]
+            impedance_values = np.asarray(last_sample_set).astype(np.int32)
 
-                # Output sample data
-                self.output.emit(impedance_values)
-                
-            # Pause the thread so that the update does not happen too fast
-            time.sleep(1)
+            # Output sample data
+            self.output.emit(impedance_values)
             
     def stop(self):
         """ Method that is executed when the thread is terminated. 
@@ -30,9 +30,9 @@ TMSiSDK: Plotter object that displays incoming sample data in real-time.
 from PySide2 import QtWidgets, QtGui, QtCore
 import numpy as np
 import pyqtgraph as pg
-import time
 import queue
-from copy import copy
+import math
+import collections
 
 import sys
 sys.path.append("../TMSiSDK")
@@ -45,6 +45,66 @@ from plotters.plotter_gui import Ui_MainWindow
 
 from device import DeviceInterfaceType, ChannelType
 
+# Formatters for the labels of the y-axis ticks
+_fmt_name = '{: <25}'.format
+_fmt_num = '{: >12.2g}'.format
+_fmt_right = '{:< 10.2f} {}'.format
+
+# Maximum number of points per channel that is plotted for a time window
+_MAX_PLOT_POINTS = 2000
+
+def _plot_downsampling(sample_rate, window_size):
+    """ Returns the downsampling factor of the plotted time window. At most 500 
+        points per second are plotted, and at most _MAX_PLOT_POINTS per window, 
+        so that the drawing cost does not grow with the window size. The factor 
+        divides the window length, so that every window holds the same number of
+        points as the time axis.
+    """
+    window_samples = int(window_size * sample_rate)
+    ds = max(int(sample_rate / 500), -(-window_samples // _MAX_PLOT_POINTS), 1)
+    while window_samples % ds:
+        ds += 1
+    return ds
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _prepare_curves_numpy(data, selection, mean, inv_diff, out_scaled, out_conn):
+    """ Scales the selected channels for plotting and determines which points
+        are connected (both points need to be finite). Non-finite samples are 
+        plotted as zero. The results are written to out_scaled and out_conn.
+    """
+    sel_data = data[selection, :]
+    valid = np.isfinite(sel_data)
+    sel_data[~valid] = 0
+    np.multiply(sel_data - mean[:, None], inv_diff[:, None], out = out_scaled)
+    out_conn[:, -1] = False
+    np.logical_and(valid[:, :-1], valid[:, 1:], out = out_conn[:, :-1])
+
+
+if HAS_NUMBA:
+    @njit(parallel = True, cache = True)
+    def _prepare_curves(data, selection, mean, inv_diff, out_scaled, out_conn):
+        num_points = data.shape[1]
+        for i in prange(selection.shape[0]):
+            ch = selection[i]
+            for j in range(num_points):
+                v = data[ch, j]
+                finite = math.isfinite(v)
+                if not finite:
+                    v = 0.0
+                out_scaled[i, j] = (v - mean[i]) * inv_diff[i]
+                if j < num_points - 1:
+                    out_conn[i, j] = finite and math.isfinite(data[ch, j + 1])
+                else:
+                    out_conn[i, j] = False
+else:
+    _prepare_curves = _prepare_curves_numpy
+
 
 class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
     """ A GUI that displays the signals on the screen. The GUI handles the 
@@ -67,17 +127,18 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
 
         
         # Create a list of displayed channels. The counter channel is never displayed
+        num_device_channels = len(self.device.channels)
         if not channel_selection:
-            self._channel_selection = np.arange(0, np.size(self.device.channels,0)-1)
+            self._channel_selection = np.arange(0, num_device_channels-1)
 
         else:
             for i in channel_selection:
                 # When indices are selected that correspond to the STATUS channel,
                 # or the COUNTER channel, remove them from the channel_selection parameter
-                if (i == np.size(self.device.channels,0)-2):
+                if (i == num_device_channels-2):
                     _idx = channel_selection.index(i)
                     channel_selection = channel_selection[:_idx]
-            self._channel_selection = np.hstack((channel_selection, np.size(self.device.channels,0)-2))
+            self._channel_selection = np.hstack((channel_selection, num_device_channels-2))
         
         # Set up UI and thread
         self.initUI()
@@ -94,12 +155,12 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
         self.RealTimePlotWidget.window.getViewBox().invertY(True)        
         
         # Configuration settings
-        self.num_channels = np.size(self._channel_selection,0)
-        self.active_channels = np.size(self.device.channels,0)
+        self.num_channels = len(self._channel_selection)
+        self.active_channels = len(self.device.channels)
         self.window_size = 5 # seconds
         self.sample_rate = self.device.config.get_sample_rate(ChannelType.counter)
         
-        self._downsampling_factor = int(self.sample_rate / 500)
+        self._downsampling_factor = _plot_downsampling(self.sample_rate, self.window_size)
         
         # Set channel list checkboxes
         self._gridbox = QtGui.QGridLayout()
@@ -107,39 +168,41 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
         
         # Create checkboxes for the active channels so that they can be selected
         self._checkboxes = []
+        self._selected_mask = np.zeros(self.active_channels - 2, dtype = bool)
+        _selection = self._channel_selection[self._channel_selection < self.active_channels - 2]
+        self._selected_mask[_selection.astype(int)] = True
         for i in range(self.active_channels - 2):
             _checkBox = QtGui.QCheckBox(self.device.channels[i].name)
-            if i in self._channel_selection:
+            if self._selected_mask[i]:
                 _checkBox.setChecked(True)
             self._gridbox.addWidget(_checkBox, i%32, np.floor(i/32))
             _checkBox.clicked.connect(self._update_channel_display)
             
             # Keep track of the checkboxes and the channel type belonging to the checkbox
             self._checkboxes.append((_checkBox,self.device.channels[i].type))
+        
+        # Look-up table with the checkbox indices for each channel type
+        self._checkbox_idx_by_type = {}
+        for i, (_, ch_type) in enumerate(self._checkboxes):
+            self._checkbox_idx_by_type.setdefault(ch_type.value, []).append(i)
             
         
         # Virtual offset for all channels
         self._plot_offset = 3
-        # Dictionary used for storing the scaling factors
-        self._plot_diff = [{'mean': 0, 'diff': 2**31 } for i in range(self.num_channels)]
-        self._plot_diff[-1]['diff'] = 1
-        self._plot_diff[-1]['mean'] = 1024
+        # Arrays used for storing the scaling factors (mean and range) of the displayed channels
+        self._plot_mean = np.zeros(self.num_channels, dtype = np.float32)
+        self._plot_diff = np.full(self.num_channels, 2**31, dtype = np.float32)
+        self._plot_diff[-1] = 1
+        self._plot_mean[-1] = 1024
+        self._update_scale_arrays()
         
-        tick_list_left = [[]]
         # Create the first instance of the y-axis ticks
-        for i in range(self.num_channels):
-            for j in [-1, 0, 1]:
-                if not bool(j):
-                    tick_list_left[0].append((int(self._plot_offset * i), f'{self.device.channels[self._channel_selection[i]].name: <25}' ))
-                else:
-                    tick_list_left[0].append((int(self._plot_offset * i + -j * self._plot_offset / 3), 
-                                              f'{ self._plot_diff[i]["mean"] + (self._plot_diff[i]["diff"] * j ) : .2g}') )
+        self._last_left_ticks = None
+        self._update_tick_cache()
+        self._update_left_ticks()
         
         # Display the unit name on the right-side y-axis
-        tick_list_right = [[(self._plot_offset*i, self.device.channels[self._channel_selection[i]].unit_name) for i in range(self.num_channels)]]
-        
-        # Write the ticks to the plot
-        self.RealTimePlotWidget.window.getAxis('left').setTicks(tick_list_left)
+        tick_list_right = [[(self._plot_offset*i, self._unit_cache[i]) for i in range(self.num_channels)]]
         self.RealTimePlotWidget.window.getAxis('right').setTicks(tick_list_right)
         
         # Disable auto-scaling and menu
@@ -152,18 +215,38 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
         self.RealTimePlotWidget.window.setYRange(-self._plot_offset / 3, (self.num_channels-2/3)*self._plot_offset)
         self.RealTimePlotWidget.window.setXRange(0, self.window_size)
 
-        # Create curves and set the position of the curve on the y-axis for each channel
-        self.curve = []
-        for i in range(self.num_channels):
-            self.c = pg.PlotCurveItem(pen = 'b')
+        # Create a curve for each channel that can be displayed (including the Status channel) once,
+        # these are shown or hidden when the channel selection changes
+        self._curve_pool = []
+        for i in range(self.active_channels - 1):
+            self.c = pg.PlotCurveItem(pen = 'b', antialias = False)
+            self.c.setVisible(False)
             self.RealTimePlotWidget.window.addItem(self.c)
-            self.c.setPos(0,(i)*self._plot_offset)
-            self.curve.append(self.c)
+            self._curve_pool.append(self.c)
+        
+        # Set the position of the curve on the y-axis for each displayed channel
+        self._assign_curves()
+        
+        # Vertical line that shows the position of the most recent samples in the plot
+        self._cursor_line = pg.InfiniteLine(angle = 90, movable = False, pen = 'r')
+        self.RealTimePlotWidget.window.addItem(self._cursor_line)
         
         # Initialise buffer for the plotter (maximum of 10 seconds)
         self._buffer_size = 10 # seconds
-        self.window_buffer = np.ones((self.active_channels, int(np.ceil(self.sample_rate*self._buffer_size)))) * np.nan
+        buffer_len = int(np.ceil(self.sample_rate*self._buffer_size))
+        # The buffer is stored time-major (samples x channels), like the incoming sample data.
+        # It is stored twice in a row, so that each time window is a contiguous part of 
+        # the double buffer. The window buffer is the first copy
+        self._double_buffer = np.full((2 * buffer_len, self.active_channels), np.nan, dtype = np.float32, order = 'C')
+        self.window_buffer = self._double_buffer[:buffer_len]
         self.samples_seen = 0
+        
+        # Time axis of the plot and the list holding the x-axis ticks
+        self._update_time_axis()
+        
+        # Output buffers for the scaled data and connect arrays, allocated on the first update
+        self._out_scaled = None
+        self._out_conn = None
 
         # Connect button clicks to code execution
         self.autoscale_button.clicked.connect(self._update_scale)
@@ -195,6 +278,7 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
             self.worker.window_size -= 1
 
             self.RealTimePlotWidget.window.setXRange(0, self.window_size)
+            self._update_time_axis()
             
             self.increase_time_button.setEnabled(True)
             self.increase_time_button.setText('Increase time range: ' + str(self.window_size + 1) + 's')
@@ -214,6 +298,7 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
             self.worker.window_size += 1
             
             self.RealTimePlotWidget.window.setXRange(0, self.window_size)
+            self._update_time_axis()
             
             self.decrease_time_button.setEnabled(True)
             self.decrease_time_button.setText('Decrease time range: ' + str(self.window_size -1) + 's')
@@ -224,366 +309,256 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
                 self.increase_time_button.setText('Increase time range: ' + str(self.window_size + 1) + 's')
 
         
+    def _update_time_axis(self):
+        """ Method that creates the time axis of the plot and the list with 
+            x-axis ticks for the current window size
+        """
+        # Ensure right amount of data points are plotted (window_size * sample_rate / downsampling factor)
+        self._downsampling_factor = _plot_downsampling(self.sample_rate, self.window_size)
+        num_points = int(self.window_size * self.sample_rate) // self._downsampling_factor
+        self._time_axis = np.arange(num_points) * (self._downsampling_factor / self.sample_rate)
+        self._bottom_tick_buf = [[(k, '') for k in range(self.window_size)]]
+        
+        # Last time (in seconds) written to the x-axis ticks
+        self._last_t_end = None
+        
     def _update_scale(self):
         """ Method responsible for updating the scale whenever user input is 
             provided to do so.
         """
-        # Find white-out region using the Status channel (can't be 0)
-        x,y = self.curve[-1].getData()
-        # Transformed data is plotted so convert back to original values for correct
-        # display of the values on the y-axis
-        y = ( y * -1  * self._plot_diff[-1]['diff'] + self._plot_diff[-1]['mean'] )
-        
-        # The white-out region is entered in the plot as zeros, which have to be 
-        # omitted from the scaling calculation
-        idx_data = np.ones(np.size(y), dtype=bool)
-        idx_whiteout = np.where(np.abs(y) == 0)[0]
-        idx_data[idx_whiteout] = False
-        
-        # Loop over all channels to find individual scaling factors
-        for i in range(self.num_channels):
-            x,y = self.curve[i].getData()
-            
-            # Convert to original sample data 
-            y = ( y  * -1 * self._plot_diff[i]['diff'] + self._plot_diff[i]['mean'])             
-            
-            # Find the mean and the difference between minimum and maximum
-            self._plot_diff[i]['mean'] = (np.max(y[idx_data]) + np.min(y[idx_data]))/2
-            self._plot_diff[i]['diff'] = np.abs(np.max(y[idx_data]) - np.min(y[idx_data]))
-            
-            # Whenever there is no difference, the difference is reset to 2^31
-            if self._plot_diff[i]['diff'] == 0:
-                self._plot_diff[i]['diff'] = 2**31
-                if i == self.num_channels - 1:
-                    self._plot_diff[i]['diff'] = 1
+        # Retrieve the displayed time window of the selected channels straight from the plot buffer,
+        # the window is a contiguous part of the double buffer
+        window_samples = int(self.window_size * self.sample_rate)
+        window_start = (self.worker.samples_seen - window_samples) % self.window_buffer.shape[0]
+        buf = self._double_buffer[window_start:window_start + window_samples, self._channel_selection]
+        
+        # Parts of the buffer that have not been written yet are NaN-values, which are 
+        # omitted from the scaling calculation by fmax/fmin
+        mx = np.fmax.reduce(buf, axis = 0)
+        mn = np.fmin.reduce(buf, axis = 0)
+        new_mean = (mx + mn) / 2
+        new_diff = np.abs(mx - mn)
+        
+        # Whenever there is no difference (or no data), the difference is reset to 2^31 (1 for the Status channel)
+        invalid = np.isnan(new_mean)
+        new_mean[invalid] = 0
+        new_diff[np.logical_or(invalid, new_diff == 0)] = 2**31
+        if new_diff[-1] == 2**31:
+            new_diff[-1] = 1
+        
+        self._plot_mean[:] = new_mean
+        self._plot_diff[:] = new_diff
+        self._update_scale_arrays()
         
         # Update the range of the displayed y-axis range
         self.RealTimePlotWidget.window.setYRange(-self._plot_offset / 3, (self.num_channels - 2/3)*self._plot_offset)
         
         # Update the list of ticks on the y-axis for all channels
-        tick_list_left = [[]]
+        self._update_left_ticks()
         
-        for i in range(self.num_channels):
-            for j in [-1, 0, 1]:
-                if not bool(j):
-                    tick_list_left[0].append((int(self._plot_offset * i), f'{self.device.channels[self._channel_selection[i]].name: <25}' ))
-                else:
-                    tick_list_left[0].append((int(self._plot_offset * i + -j * self._plot_offset / 3), 
-                                              f'{ self._plot_diff[i]["mean"] + (self._plot_diff[i]["diff"] * j )  : >12.2g}') )
+    def _update_scale_arrays(self):
+        """ Method that stores the inverse of the scaling ranges, so that all 
+            channels can be scaled with a multiplication in update_plot. The 
+            negative sign is needed due to the inverted y axis.
+        """
+        self._inv_diff_arr = (-1.0 / self._plot_diff).astype(np.float32)
         
-        self.RealTimePlotWidget.window.getAxis('left').setTicks(tick_list_left)
+    def _update_tick_cache(self):
+        """ Method that caches the channel names and units of the displayed 
+            channels, as well as the list that holds the right-side y-axis ticks.
+            Needs to be called whenever the channel selection changes.
+        """
+        channels = self.device.channels
+        self._left_name_cache = [_fmt_name(channels[ch].name) for ch in self._channel_selection]
+        self._unit_cache = [channels[ch].unit_name for ch in self._channel_selection]
+        self._right_tick_buf = [[(int(self._plot_offset*i), '') for i in range(self.num_channels)]]
+        self._last_right_labels = None
+        
+    def _update_left_ticks(self):
+        """ Method that writes the channel names and the scaling values to the 
+            left-side y-axis
+        """
+        tick_list_left = [[]]
+        append = tick_list_left[0].append
+        for i in range(self.num_channels):
+            mean = float(self._plot_mean[i])
+            diff = float(self._plot_diff[i])
+            offset = self._plot_offset * i
+            append((int(offset + self._plot_offset / 3), _fmt_num(mean - diff)))
+            append((int(offset), self._left_name_cache[i]))
+            append((int(offset - self._plot_offset / 3), _fmt_num(mean + diff)))
+        
+        # Only update the axis when the ticks changed, as this triggers a new layout of the axis
+        if tick_list_left != self._last_left_ticks:
+            self._last_left_ticks = tick_list_left
+            self.RealTimePlotWidget.window.getAxis('left').setTicks(tick_list_left)
         
     def _update_channel_display(self):
         """ Method that updates which channels are displayed.
         """
         
-        # Make a copy of the current channel indices that are displayed
-        _idx_curve_list = np.copy(self._channel_selection)
-        
-        # Update the channel selection based on the clicked checkboxes
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][0].isChecked():
-                if i in self._channel_selection:
-                    pass
-                else:
-                    # Create a flag that states if the number of channels displayed increases
-                    _increase = True
-                    self._channel_selection = np.hstack((self._channel_selection,i))
-            else:
-                if i in self._channel_selection:
-                    # Create a flag that states if the number of channels displayed decreases
-                    _increase = False
-                    self._channel_selection = np.delete(self._channel_selection, self._channel_selection == i)
-                else:
-                    pass
-
-        # Sort the indices from small to large, to update them appropriately in the plot
-        self._channel_selection.sort()
-        
-        # Update the num_channels parameter that keeps track of the amount of channels that are displayed in the plot
-        self.num_channels = np.size(self._channel_selection,0)
-        
-        # Make a copy of the dictionary containing the scaling parameters of all channels
-        copy_plot_diff = self._plot_diff.copy()
+        # Determine which channels are selected based on the clicked checkboxes
+        new_mask = np.array([cb[0].isChecked() for cb in self._checkboxes], dtype = bool)
+        if np.array_equal(new_mask, self._selected_mask):
+            return
+        self._selected_mask = new_mask
         
-        # Initialise a counter parameter required for passing the scaling factors
-        count = 0
+        # The scaling parameters of channels that remain displayed are kept, the
+        # other channels get the default scaling parameters
+        all_mean = np.zeros(self.active_channels, dtype = np.float32)
+        all_diff = np.full(self.active_channels, 2**31, dtype = np.float32)
+        all_mean[self._channel_selection] = self._plot_mean
+        all_diff[self._channel_selection] = self._plot_diff
         
-        # Create a new dictionary with scaling parameters, which is updated with the old values in the next step
-        self._plot_diff = [{'mean': 0, 'diff': 2**31 } for i in range(self.num_channels)]
+        # The selected channels are sorted from small to large, the Status channel is always displayed last
+        self._channel_selection = np.append(np.flatnonzero(new_mask), self.active_channels - 2)
         
-        # Depending on whether the displayed number of channels increases or decreases, pass the old scaling factors appropriately
-        if _increase:
-            _idx_overlap = [np.where(i == self._channel_selection)[0][0] for idx,i in enumerate(_idx_curve_list) if i in self._channel_selection]
-            
-            for i in range(self.num_channels):
-                if i in _idx_overlap:
-                    self._plot_diff[i]['mean'] = copy_plot_diff[count]['mean']
-                    self._plot_diff[i]['diff'] = copy_plot_diff[count]['diff']
-                    count += 1       
-        else:
-            _idx_overlap = [np.where(i == _idx_curve_list)[0][0] for idx,i in enumerate(_idx_curve_list) if i in self._channel_selection]
-            
-            for i in range(self.num_channels):
-                self._plot_diff[i]['mean'] = copy_plot_diff[_idx_overlap[count]]['mean']
-                self._plot_diff[i]['diff'] = copy_plot_diff[_idx_overlap[count]]['diff']
-                count += 1        
+        # Update the num_channels parameter that keeps track of the amount of channels that are displayed in the plot
+        self.num_channels = len(self._channel_selection)
         
-        # Reset the parameter keeping track of the plotted graphis items and clear the window
-        self.curve = []
-        self.RealTimePlotWidget.window.clear()
+        # Select the scaling parameters of the displayed channels
+        self._plot_mean = all_mean[self._channel_selection]
+        self._plot_diff = all_diff[self._channel_selection]
+        self._update_scale_arrays()
         
-        # Generate the new graphics objects required for plotting
-        for i in range(self.num_channels):
-            self.c = pg.PlotCurveItem(pen = 'b')
-            self.RealTimePlotWidget.window.addItem(self.c)
-            self.c.setPos(0,(i)*self._plot_offset)
-            self.curve.append(self.c)
+        # Show the curves of the displayed channels at their new position and hide the others
+        self._assign_curves()
         
         # Update the range of the displayed y-axis range so that all channels are included in the plot
         self.RealTimePlotWidget.window.setYRange(-self._plot_offset / 3, (self.num_channels - 2/3)*self._plot_offset)
         
-        # Update the list of ticks on the y-axis for all channels
-        tick_list_left = [[]]
-        
-        for i in range(self.num_channels):
-            for j in [-1, 0, 1]:
-                if not bool(j):
-                    tick_list_left[0].append((int(self._plot_offset * i), f'{self.device.channels[self._channel_selection[i]].name: <25}' ))
-                else:
-                    tick_list_left[0].append((int(self._plot_offset * i + -j * self._plot_offset / 3), 
-                                              f'{ self._plot_diff[i]["mean"] + (self._plot_diff[i]["diff"] * j )  : >12.2g}') )
-        
-        self.RealTimePlotWidget.window.getAxis('left').setTicks(tick_list_left)
+        # Update the cached channel names and units, and the list of ticks on the y-axis for all channels
+        self._update_tick_cache()
+        self._update_left_ticks()
         
         
-    def _show_all_UNI(self):
-        """ Method that checks all channels of type UNI so that they are displayed 
-            in the plot
+    def _assign_curves(self):
+        """ Method that shows the curves of the displayed channels, sets their 
+            position on the y-axis and hides the curves of the other channels
         """
+        displayed = set(self._channel_selection.tolist())
+        for ch, curve in enumerate(self._curve_pool):
+            if ch not in displayed:
+                curve.setVisible(False)
         
-        # Find all channel indices that are of type UNI 
-        UNI_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.UNI.value]
+        self.curve = []
+        for i, ch in enumerate(self._channel_selection.tolist()):
+            curve = self._curve_pool[ch]
+            curve.setPos(0, i*self._plot_offset)
+            curve.setVisible(True)
+            self.curve.append(curve)
+        
+    def _set_all(self, type_value, checked):
+        """ Method that (un)checks all channels of the given channel type so 
+            that they are (not) displayed in the plot
+        """
+        checkboxes = [self._checkboxes[i][0] for i in self._checkbox_idx_by_type.get(type_value, [])]
         
-        # When all UNI channels are already checked, do not update the plot
-        if all(self._checkboxes[i][0].isChecked() for i in UNI_lst):
+        # When all channels already have the requested state, do not update the plot
+        if all(cb.isChecked() == checked for cb in checkboxes):
             return
         
-        # Set all UNI channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.UNI.value:
-                self._checkboxes[i][0].setChecked(True)
-                
+        for cb in checkboxes:
+            cb.setChecked(checked)
         
         # Call the update function (normally called by individual checkboxes)
         self._update_channel_display()
         
+    def _show_all_UNI(self):
+        """ Method that checks all channels of type UNI """
+        self._set_all(ChannelType.UNI.value, True)
         
     def _hide_all_UNI(self):
-        """ Method that unchecks all channels of type UNI so that they are not
-            displayed in the plot
-        """
-        
-        # Find all channel indices that are of type UNI 
-        UNI_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.UNI.value]
-        
-        # When all UNI channels are already unchecked, do not update the plot
-        if all(not self._checkboxes[i][0].isChecked() for i in UNI_lst):
-            return
-        
-        # Set all UNI channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.UNI.value:
-                self._checkboxes[i][0].setChecked(False)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
-        
+        """ Method that unchecks all channels of type UNI """
+        self._set_all(ChannelType.UNI.value, False)
         
     def _show_all_BIP(self):
-        """ Method that checks all channels of type BIP so that they are displayed 
-            in the plot
-        """
-        
-        # Find all channel indices that are of type BIP 
-        BIP_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.BIP.value]
-        
-        # When all BIP channels are already checked, do not update the plot
-        if all(self._checkboxes[i][0].isChecked() for i in BIP_lst):
-            return
-        
-        # Set all BIP channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.BIP.value:
-                self._checkboxes[i][0].setChecked(True)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
-        
+        """ Method that checks all channels of type BIP """
+        self._set_all(ChannelType.BIP.value, True)
         
     def _hide_all_BIP(self):
-        """ Method that unchecks all channels of type BIP so that they are not
-            displayed in the plot
-        """
-        
-        # Find all channel indices that are of type BIP 
-        BIP_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.BIP.value]
-        
-        # When all BIP channels are already unchecked, do not update the plot
-        if all(not self._checkboxes[i][0].isChecked() for i in BIP_lst):
-            return
-        
-        # Set all BIP channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.BIP.value:
-                self._checkboxes[i][0].setChecked(False)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
-        
+        """ Method that unchecks all channels of type BIP """
+        self._set_all(ChannelType.BIP.value, False)
         
     def _show_all_AUX(self):
-        """ Method that checks all channels of type AUX so that they are displayed 
-            in the plot
-        """
-        
-        # Find all channel indices that are of type AUX 
-        AUX_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.AUX.value]
-        
-        # When all AUX channels are already checked, do not update the plot
-        if all(self._checkboxes[i][0].isChecked() for i in AUX_lst):
-            return
-        
-        # Set all AUX channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.AUX.value:
-                self._checkboxes[i][0].setChecked(True)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
-        
+        """ Method that checks all channels of type AUX """
+        self._set_all(ChannelType.AUX.value, True)
         
     def _hide_all_AUX(self):
-        """ Method that unchecks all channels of type AUX so that they are not
-            displayed in the plot
-        """
-        
-        # Find all channel indices that are of type AUX 
-        AUX_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.AUX.value]
-        
-        # When all AUX channels are already unchecked, do not update the plot
-        if all(not self._checkboxes[i][0].isChecked() for i in AUX_lst):
-            return
-        
-        # Set all AUX channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.AUX.value:
-                self._checkboxes[i][0].setChecked(False)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
+        """ Method that unchecks all channels of type AUX """
+        self._set_all(ChannelType.AUX.value, False)
         
     def _show_all_DIGI(self):
-        """ Method that checks all channels of type sensor so that they are displayed 
-            in the plot
-        """
-        
-        # Find all channel indices that are of type sensor 
-        DIGI_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.sensor.value]
-        
-        # When all sensor channels are already checked, do not update the plot
-        if all(self._checkboxes[i][0].isChecked() for i in DIGI_lst):
-            return
-        
-        # Set all sensor channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.sensor.value:
-                self._checkboxes[i][0].setChecked(True)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()
-        
+        """ Method that checks all channels of type sensor """
+        self._set_all(ChannelType.sensor.value, True)
         
     def _hide_all_DIGI(self):
-        """ Method that unchecks all channels of type sensor so that they are not
-            displayed in the plot
-        """
-        
-        # Find all channel indices that are of type DIGI 
-        DIGI_lst = [i for i in range(np.size(self._checkboxes,0)) if self._checkboxes[i][1].value == ChannelType.sensor.value]
-        
-        # When all DIGI channels are already unchecked, do not update the plot
-        if all(not self._checkboxes[i][0].isChecked() for i in DIGI_lst):
-            return
-        
-        # Set all DIGI channels' checkboxes to the Checked state
-        for i in range(np.size(self._checkboxes,0)):
-            if self._checkboxes[i][1].value == ChannelType.sensor.value:
-                self._checkboxes[i][0].setChecked(False)
-                
-        
-        # Call the update function (normally called by individual checkboxes)
-        self._update_channel_display()        
+        """ Method that unchecks all channels of type sensor """
+        self._set_all(ChannelType.sensor.value, False)
 
         
-    @QtCore.Slot(object)
-    def update_plot(self, data):
+    @QtCore.Slot(object, int, object)
+    def update_plot(self, data, idx_final, newest_sample):
         """ Method that receives the data from the sampling thread and writes
-            it to the GUI window.
+            it to the GUI window. idx_final is the index of the most recent 
+            samples in the data, which is where the cursor line is drawn. 
+            newest_sample holds the most recent (not downsampled) value of each
+            channel, which is shown in the right-side yticks.
         """
         
-        # PyQtGraph can't handle NaN-values, therefore the WhiteOut has to be implemented differently.
-        # This is done using a boolean array that states which points should not be connected (NaN values)        
-        con = np.isfinite(data)
-        data[~con] = 0
-        
-        # Find final index for updating values in right-side yticks list
-        idx_final = np.where(con[0,:] == False)
-        # Check whether the vector is not empty (can occur upon rescaling) and 
-        # stop the plot update when this is the case
-        if not idx_final[0].any():
-            return
-        
-        # The last added value is the value before the White-out region.
-        # As the white-out region resets each time the end of the window is reached,
-        # different logic is needed when the white-out region lies around the wrapping points of the window
-        if idx_final[0][0] != 0:
-            idx_final = idx_final[0][0]-1
-        elif idx_final[0][0] == 0 and idx_final[0][-1] != (self.window_size * self.sample_rate)/self._downsampling_factor - 1:
-            idx_final = (self.window_size * self.sample_rate)/self._downsampling_factor - 1
-        else:
-            dummy_idx = np.where(idx_final[0][:] > 0.9 * (self.window_size * self.sample_rate)/self._downsampling_factor)
-            idx_final = idx_final[0][dummy_idx[0][0]]-1
-        
-        
-        # Update the x-axis ticks so that the time base is reflected correctly on the x-axis
-        t_end = int(np.nanmax(data[-1,:] / self.sample_rate))
-        bottom_ticks = [[(val % self.window_size, str(val)) for val in np.arange(t_end-(self.window_size-1), t_end+1, dtype=int)]]
-        self.RealTimePlotWidget.window.getAxis('bottom').setTicks(bottom_ticks)
+        # The plot buffer is single precision, ensure the received data is as well
+        data = np.asarray(data, dtype = np.float32)
         
-        # Ensure right amount of data points are plotted (window_size * sample_rate)
-        time_axis = np.arange(0, self.window_size, self._downsampling_factor/self.sample_rate)        
+        # Block repaints of the widget until all items are updated, so that it is redrawn once
+        self.RealTimePlotWidget.setUpdatesEnabled(False)
         
         # Try to update the plot, due to user actions plotting might result in a warning
         # for that specific plot instance, hence the try-except statement
         try:
+            # Update the x-axis ticks so that the time base is reflected correctly on the x-axis.
+            # The ticks only change when a new second is reached, and are kept as they are 
+            # when the window does not contain any counter values yet
+            counter = data[-1, np.isfinite(data[-1,:])]
+            t_end = int(counter.max() / self.sample_rate) if counter.size else self._last_t_end
+            if t_end != self._last_t_end:
+                bottom_ticks = self._bottom_tick_buf
+                t_start = t_end - (self.window_size - 1)
+                for k in range(self.window_size):
+                    bottom_ticks[0][k] = ((t_start + k) % self.window_size, str(t_start + k))
+                self.RealTimePlotWidget.window.getAxis('bottom').setTicks(bottom_ticks)
+                self._last_t_end = t_end
+            
+            # Apply scaling to all displayed channels at once and multiply with negative 1 (needed due to inverted y axis).
+            # A point is connected to the next one only when both are valid samples. PyQtGraph can't handle 
+            # NaN-values (samples that have not been received yet), hence the boolean connect array
+            out_shape = (self.num_channels, data.shape[1])
+            if self._out_scaled is None or self._out_scaled.shape != out_shape:
+                self._out_scaled = np.empty(out_shape, dtype = np.float32)
+                self._out_conn = np.empty(out_shape, dtype = bool)
+            scaled, connect = self._out_scaled, self._out_conn
+            _prepare_curves(data, self._channel_selection, self._plot_mean, self._inv_diff_arr, scaled, connect)
+            
+            # The most recent samples are not connected to the oldest samples that follow them
+            connect[:, idx_final] = False
+            self._cursor_line.setPos(self._time_axis[idx_final])
+            
             for i in range(self.num_channels):
-                # Draw data (apply scaling and multiply with negative 1 (needed due to inverted y axis))
-                self.curve[i].setData(time_axis, (data[self._channel_selection[i],:] - self._plot_diff[i]['mean']) / self._plot_diff[i]['diff'] * -1,
-                                      connect = np.logical_and(con[i,:], np.roll(con[i,:], -1)))
+                # Draw data (NaN-values were replaced above, so the finite check can be skipped)
+                self.curve[i].setData(self._time_axis, scaled[i], connect = connect[i], skipFiniteCheck = True)
             
-            # Update the ticks on the right side of the plot
-            tick_list_right = [[(int(self._plot_offset*i), f'{data[self._channel_selection[i],int(idx_final)]:< 10.2f} {self.device.channels[self._channel_selection[i]].unit_name}') \
-                                for i in range(self.num_channels)]]        
-            self.RealTimePlotWidget.window.getAxis('right').setTicks(tick_list_right)
+            # Update the ticks on the right side of the plot, only the values change
+            final_values = np.nan_to_num(newest_sample[self._channel_selection], nan = 0, posinf = 0, neginf = 0)
+            right_labels = list(map(_fmt_right, final_values.tolist(), self._unit_cache))
+            if right_labels != self._last_right_labels:
+                self._last_right_labels = right_labels
+                tick_list_right = self._right_tick_buf
+                for i in range(self.num_channels):
+                    tick_list_right[0][i] = (tick_list_right[0][i][0], right_labels[i])
+                self.RealTimePlotWidget.window.getAxis('right').setTicks(tick_list_right)
         except Exception:
             pass
+        finally:
+            self.RealTimePlotWidget.setUpdatesEnabled(True)
         
     def setupThread(self):
         """ Method that initialises the sampling thread of the device
@@ -622,11 +597,124 @@ class RealTimePlot(QtWidgets.QMainWindow, Ui_MainWindow):
         
         QtWidgets.QApplication.quit()
 
+def _write_ring(buffer, start, block):
+    """ Writes a block of sample data (samples x channels) to the ring buffer,
+        starting at sample index start. The write wraps around at the end of the
+        buffer, so it consists of at most two contiguous copies.
+    """
+    period = buffer.shape[0]
+    num_samples = block.shape[0]
+    
+    # Only the final part of a block that is longer than the buffer remains visible
+    if num_samples > period:
+        start += num_samples - period
+        block = block[-period:]
+        num_samples = period
+    
+    start %= period
+    end = start + num_samples
+    if end <= period:
+        np.copyto(buffer[start:end], block)
+    else:
+        split = period - start
+        np.copyto(buffer[start:], block[:split])
+        np.copyto(buffer[:end - period], block[split:])
+
+def _gather_window_numpy(buffer, window_start, window_len, split_idx, ds, out):
+    """ Gathers the downsampled time window from the (time-major) double buffer
+        into out (channels x samples). The window starts at window_start, the 
+        part after the wrapping point (split_idx) is placed first, the part 
+        before it second.
+    """
+    window = buffer[window_start:window_start + window_len]
+    second_start = (split_idx - window_len) % ds
+    np.concatenate((window[split_idx::ds], window[second_start:split_idx:ds]), axis = 0, out = out.T)
+
+
+if HAS_NUMBA:
+    @njit(cache = True)
+    def _gather_window(buffer, window_start, window_len, split_idx, ds, out):
+        second_start = (split_idx - window_len) % ds
+        j = 0
+        for k in range(split_idx, window_len, ds):
+            for ch in range(buffer.shape[1]):
+                out[ch, j] = buffer[window_start + k, ch]
+            j += 1
+        for k in range(second_start, split_idx, ds):
+            for ch in range(buffer.shape[1]):
+                out[ch, j] = buffer[window_start + k, ch]
+            j += 1
+else:
+    _gather_window = _gather_window_numpy
+
+
+def _decimate_minmax_numpy(buffer, start, stop, ds, out, j):
+    """ Decimates the (time-major) samples buffer[start:stop] by a factor ds 
+        and writes the result to out (channels x samples), starting at column j. 
+        The samples are divided in buckets of 2*ds samples, of which the minimum 
+        and maximum are written, so that peaks remain visible with the same 
+        number of points as taking every ds-th sample. A final bucket that only 
+        holds a single point keeps its first sample. A bucket that contains a 
+        NaN-value (not yet received) is written as NaN. Returns the next column.
+    """
+    num_points = len(range(start, stop, ds))
+    num_buckets = num_points // 2
+    if num_buckets > 0:
+        segment = buffer[start:min(stop, start + 2 * num_buckets * ds)]
+        bucket_idx = np.arange(0, segment.shape[0], 2 * ds)
+        out[:, j:j + 2 * num_buckets:2] = np.minimum.reduceat(segment, bucket_idx, axis = 0).T
+        out[:, j + 1:j + 2 * num_buckets:2] = np.maximum.reduceat(segment, bucket_idx, axis = 0).T
+    if num_points % 2:
+        out[:, j + num_points - 1] = buffer[start + (num_points - 1) * ds]
+    return j + num_points
+
+
+if HAS_NUMBA:
+    @njit(cache = True)
+    def _decimate_minmax(buffer, start, stop, ds, out, j):
+        num_points = len(range(start, stop, ds))
+        for b in range(num_points // 2):
+            lo = start + 2 * b * ds
+            hi = min(stop, lo + 2 * ds)
+            for ch in range(buffer.shape[1]):
+                mn = buffer[lo, ch]
+                mx = mn
+                for k in range(lo + 1, hi):
+                    v = buffer[k, ch]
+                    if v < mn or v != v:
+                        mn = v
+                    if v > mx or v != v:
+                        mx = v
+                    if v != v:
+                        break
+                out[ch, j] = mn
+                out[ch, j + 1] = mx
+            j += 2
+        if num_points % 2:
+            for ch in range(buffer.shape[1]):
+                out[ch, j] = buffer[start + (num_points - 1) * ds, ch]
+            j += 1
+        return j
+else:
+    _decimate_minmax = _decimate_minmax_numpy
+
+def _reshape_sample_data(sd):
+    """ Reshapes the flat samples of a <SampleData>-object to samples x channels,
+        in the float32 format of the plot buffer.
+    """
+    return np.asarray(sd.samples, dtype = np.float32).reshape((sd.num_sample_sets, sd.num_samples_per_sample_set))
+
+# Number of sample sets that fit in the queue of the plotter
+_RING_CAPACITY = 1000
+
+# Interval (in ms) at which the queue is drained and the plot is refreshed (~60 Hz)
+_REFRESH_INTERVAL = 16
+
 class SamplingThread(QtCore.QObject):
     """ Class responsible for sampling and preparing data for the GUI window.
     """
     # Initialise the ouptut object
-    output = QtCore.Signal(object)
+    output = QtCore.Signal(object, int, object)
     def __init__(self, main_class):
         """ Setting up the class' properties that were passed from the GUI thread
         """
@@ -634,14 +722,14 @@ class SamplingThread(QtCore.QObject):
         # Access initialised values from the GUI class
         self.num_channels = main_class.num_channels
         self.sample_rate = main_class.sample_rate
-        self.window_size = main_class.window_size
         self.window_buffer = main_class.window_buffer
+        self._double_buffer = main_class._double_buffer
         self._buffer_size = main_class._buffer_size
+        self._buffer_len = self.window_buffer.shape[0]
+        self.window_size = main_class.window_size
         self.samples_seen = main_class.samples_seen
         self.device = main_class.device
         
-        self._downsampling_factor = main_class._downsampling_factor
-        
         self.filter_app=main_class.filter_app
         
         # Register to filter_app or sample data server and start measurement
@@ -649,9 +737,8 @@ class SamplingThread(QtCore.QObject):
             # Start the measurement using the filter thread
             self.filter_app.start()
         else:
-            # Prepare Queue
-            _QUEUE_SIZE = 1000
-            self.q_sample_sets = queue.Queue(_QUEUE_SIZE)
+            # Prepare a lock-free ring buffer as queue (the plotter is its only consumer)
+            self.q_sample_sets = sample_data_server.SampleDataRing(_RING_CAPACITY)
         
             # Register the consumer to the sample data server
             sample_data_server.registerConsumer(self.device.id, self.q_sample_sets)
@@ -663,137 +750,136 @@ class SamplingThread(QtCore.QObject):
         self.sampling = True
     
 
+    @property
+    def window_size(self):
+        """ Time range of the plot (in seconds) """
+        return self._window_size
+
+    @window_size.setter
+    def window_size(self, value):
+        """ Sets the time range of the plot, and caches the size of the plot 
+            window and the downsampling factor that depend on it
+        """
+        self._window_size = value
+        self._window_samples = int(value * self.sample_rate)
+        self._downsampling_factor = _plot_downsampling(self.sample_rate, value)
+
+    def _write_buffer(self, start, block):
+        """ Method that writes a block of sample data to both copies of the 
+            double buffer
+        """
+        _write_ring(self._double_buffer[:self._buffer_len], start, block)
+        _write_ring(self._double_buffer[self._buffer_len:], start, block)
+
+    def _write_samples(self, samples):
+        """ Method that writes the sample data to the plot buffer
+        """
+        self._write_buffer(self.samples_seen, samples)
+        
+        # Update number of samples seen by the plotter
+        self.samples_seen += samples.shape[0]
+
+    def _plot_window(self):
+        """ Method that retrieves the (downsampled) time window that needs to 
+            be plotted from the plot buffer. Returns the plot data, the index
+            of the most recent samples within the plot data and a copy of the 
+            most recent sample of each channel (the downsampled point at that 
+            index may be the minimum or maximum of a bucket).
+        """
+        # The plotted time window ranges until the most recent sample,
+        # and is a contiguous part of the double buffer
+        first_idx = self.samples_seen - self._window_samples
+        window_start = first_idx % self._buffer_len
+        
+        # The window has a wrapping point, as the plot shows a fixed time window
+        # the wrapping point needs to be identified to ensure that the plot does not 'jump'.
+        split_idx = (1 - first_idx) % self._window_samples
+        
+        # Retrieve the correct sample data that needs to be plotted. The part after the 
+        # wrapping point is plotted first, the downsampling continues into the second part.
+        # A new output array is used for every window, as the GUI thread keeps the emitted one
+        ds = self._downsampling_factor
+        second_start = (split_idx - self._window_samples) % ds
+        num_first = len(range(split_idx, self._window_samples, ds))
+        num_points = num_first + len(range(second_start, split_idx, ds))
+        plot_data = np.empty((self._double_buffer.shape[1], num_points), dtype = np.float32)
+        if ds > 1:
+            # Min/max decimation, so that peaks in the signals are not lost by downsampling
+            j = _decimate_minmax(self._double_buffer, window_start + split_idx, 
+                                 window_start + self._window_samples, ds, plot_data, 0)
+            _decimate_minmax(self._double_buffer, window_start + second_start, 
+                             window_start + split_idx, ds, plot_data, j)
+        else:
+            _gather_window(self._double_buffer, window_start, self._window_samples, split_idx, ds, plot_data)
+        
+        # The most recent samples are at the end of the part after the wrapping point
+        newest_sample = self._double_buffer[(self.samples_seen - 1) % self._buffer_len].copy()
+        return plot_data, num_first - 1, newest_sample
+
+    def _start_timer(self, drain):
+        """ Method that starts draining the queue at the refresh rate of the plot.
+            The timer is created here, so that it runs in the sampling thread.
+        """
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(drain)
+        self._timer.start(_REFRESH_INTERVAL)
+
     @QtCore.Slot()
     def update_samples(self): 
-        """ Method that retrieves samples from the queue and processes the samples.
-            Processing includes reshaping the data into the desired format, adding
-            white out region to show the refresh rate of the plot.
+        """ Method that starts retrieving samples from the sample_data_server queue.
         """
-        lag = False
-        while self.sampling:
-            while not self.q_sample_sets.empty():
-                # If the sample_data_server queue contains more than 10 items, the queue is trimmed so that the plotter 
-                # has a lower delay
-                if self.q_sample_sets.qsize() > 10:
-                    lag = True
-                    print('The plotter skipped some samples to compensate for lag..')
-
-                elif self.q_sample_sets.qsize() < 6:
-                    lag = False
-                
-                
-                # Retrieve sample data from the sample_data_server queue
-                sd = self.q_sample_sets.get()
-                self.q_sample_sets.task_done()
-                
-                # Reshape the samples retrieved from the queue
-                samples = np.reshape(sd.samples, (sd.num_samples_per_sample_set, sd.num_sample_sets), order = 'F')
-                
-                # Add a White out region to show the update of the samples
-                white_out = int(np.floor(self.window_size*self.sample_rate*0.04))
-                plot_indices = (self.samples_seen + (np.arange(np.size(samples,1) + white_out) ) ) % \
-                    (self.sample_rate * self._buffer_size) 
-                
-                # Write sample data to the plot buffer
-                self.window_buffer[:,plot_indices[:-white_out]] = samples
-                self.window_buffer[:,plot_indices[-white_out:]] = np.nan
-                
-                # Update number of samples seen by the plotter
-                self.samples_seen += np.size(samples,1)
-                
-                # When the plotter lags, don't output the sample data to the plotter until (most of) the lag is gone
-                if lag:
-                    time.sleep(0.001)
-                else:
-    
-                    # The indices to be plotted ranges until the final index of the white out region,
-                    # and has a total number of samples equal to the window size
-                    indices = np.arange(((self.samples_seen + white_out)  - \
-                                     (self.window_size * self.sample_rate)) , \
-                                        (self.samples_seen + white_out) , dtype = int)
-                    
-                    # The indices have to match with the indices of the window buffer
-                    scroll_idx = (indices) % (self.sample_rate * self._buffer_size)
-    
-                    # The buffer indices have a wrapping point (e.g. in a buffer of 4000 samples, the wrapping point is from 3999 to 0)
-                    # As the window size might not line up with this exactly,
-                    # the wrapping point needs to be identified to ensure that the plot does not 'jump'.
-                    split_idx = np.where(indices % (self.sample_rate * self.window_size) == 1)[0][0]
-                    
-                    # Retrieve the correct sample data that needs to be plotted
-                    plot_data = np.hstack((self.window_buffer[:, scroll_idx[split_idx:]], \
-                                           self.window_buffer[:, scroll_idx[0:split_idx]]))
-                    
-                    plot_data = plot_data[:,::self._downsampling_factor]
-                        
-                    # Output sample data
-                    self.output.emit(plot_data)
-                
-                    # Pause the thread for a small time so that plot can be updated before receiving next data chunk
-                    # Pause should be long enough to have the screen update itself
-                    time.sleep(0.01)
+        self._start_timer(lambda: self._drain(self.q_sample_sets, _reshape_sample_data))
             
     @QtCore.Slot()
     def update_filtered_samples(self): 
-        """ Method that retrieves samples from the queue and processes the samples.
-            Processing includes reshaping the data into the desired format, adding
-            white out region to show the refresh rate of the plot.
+        """ Method that starts retrieving samples from the queue of the filter.
+            Filtered samples are received as channels x samples.
         """
-        lag=False
-        while self.sampling:
-            while not self.filter_app.q_filtered_sample_sets.empty():
-                if self.filter_app.q_filtered_sample_sets.qsize() > 10:
-                    lag = True
-                    print('The plotter skipped some samples to compensate for lag..')
-
-                elif self.filter_app.q_filtered_sample_sets.qsize() < 6:
-                    lag = False
-
-                sd = self.filter_app.q_filtered_sample_sets.get()
-                self.filter_app.q_filtered_sample_sets.task_done()
-                samples = copy(sd)
-
-                # Add a White out region to show the update of the samples
-                white_out = int(np.floor(self.window_size*self.sample_rate*0.04))
-                plot_indices = (self.samples_seen + (np.arange(np.size(samples,1) + white_out) ) ) % \
-                    (self.sample_rate * self._buffer_size) 
-                
-                # Write sample data to the plot buffer
-                self.window_buffer[:,plot_indices[:-white_out]] = samples
-                self.window_buffer[:,plot_indices[-white_out:]] = np.nan
-                
-                # Update number of samples seen by the plotter
-                self.samples_seen += np.size(samples,1)
-                
-                if lag:
-                        time.sleep(0.001)
-                else:    
-                    # The indices to be plotted ranges until the final index of the white out region,
-                    # and has a total number of samples equal to the window size
-                    indices = np.arange(((self.samples_seen + white_out)  - \
-                                     (self.window_size * self.sample_rate)) , \
-                                        (self.samples_seen + white_out) , dtype = int)
-                    
-                    # The indices have to match with the indices of the window buffer
-                    scroll_idx = (indices) % (self.sample_rate * self._buffer_size)
-    
-                    # The buffer indices have a wrapping point (e.g. in a buffer of 4000 samples, the wrapping point is from 3999 to 0)
-                    # As the window size might not line up with this exactly,
-                    # the wrapping point needs to be identified to ensure that the plot does not 'jump'.
-                    split_idx = np.where(indices % (self.sample_rate * self.window_size) == 1)[0][0]
-                    
-                    # Retrieve the correct sample data that needs to be plotted
-                    plot_data = np.hstack((self.window_buffer[:, scroll_idx[split_idx:]], \
-                                           self.window_buffer[:, scroll_idx[0:split_idx]]))
-                    
-                    plot_data = plot_data[:,::self._downsampling_factor]
-                        
-                    # Output sample data
-                    self.output.emit(plot_data)
-                
-                    # Pause the thread for a small time so that plot can be updated before receiving next data chunk
-                    # Pause should be long enough to have the screen update itself
-                    time.sleep(0.01)
+        self._start_timer(lambda: self._drain(self.filter_app.q_filtered_sample_sets, np.transpose))
+
+    def _drain(self, q, adapt):
+        """ Method that retrieves all available samples from the queue and processes 
+            the samples. Processing includes converting the data into the desired 
+            format (adapt returns the samples x channels data of a queue item) 
+            and writing it to the plot buffer.
+            Only the most recent time window is output to the plotter, so that the 
+            plotter does not lag behind when more samples arrived than can be drawn.
+        """
+        if not self.sampling:
+            self._timer.stop()
+            return
+        
+        # Retrieve all available sample data from the queue at once. When the plotter lags 
+        # behind, the oldest sample sets would be overwritten by the newer ones within the
+        # same update: these are skipped and only counted as seen by the plotter
+        sample_sets = collections.deque()
+        num_samples = 0
+        while True:
+            try:
+                samples = adapt(q.get_nowait())
+            except queue.Empty:
+                break
+            q.task_done()
+            
+            sample_sets.append(samples)
+            num_samples += samples.shape[0]
+            while num_samples - sample_sets[0].shape[0] >= self._buffer_len:
+                num_skipped = sample_sets.popleft().shape[0]
+                num_samples -= num_skipped
+                self.samples_seen += num_skipped
+        
+        if not sample_sets:
+            return
+        
+        # Combine the samples retrieved from the queue, so that the plot buffer 
+        # is written once for all retrieved sample sets
+        samples = np.concatenate(sample_sets, axis = 0, dtype = np.float32)
+        
+        # Write sample data to the plot buffer
+        self._write_samples(samples)
+        
+        # Output sample data
+        self.output.emit(*self._plot_window())
             
     def stop(self):
         """ Method that is executed when the thread is terminated. 
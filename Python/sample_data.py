@@ -36,6 +36,8 @@ class SampleSet:
         samples: <float[]> Array of samples, in order of the active channels in
                  the active channel list <Device.channels[]>
     """
+    __slots__ = ('num_samples', 'samples')
+    
     def __init__(self, num_samples, samples):
         self.num_samples = num_samples
         self.samples = samples
@@ -50,6 +52,8 @@ class SampleData:
 
         samples: <float[]> Array of samples, sequentially in sample-sets and sampling-event.
     """
+    __slots__ = ('num_sample_sets', 'num_samples_per_sample_set', 'samples')
+    
     def __init__(self, num_sample_sets, num_samples_per_sample_set, samples):
         self.num_sample_sets = num_sample_sets
         self.num_samples_per_sample_set = num_samples_per_sample_set
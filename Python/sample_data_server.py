@@ -27,6 +27,8 @@ TMSiSDK: Sample Data Server module
 
 '''
 
+import queue
+
 from TMSiSDK import settings
 
 class SampleDataConsumer:
@@ -36,6 +38,60 @@ class SampleDataConsumer:
         self.id = id
         self.q = q
 
+class SampleDataRing:
+    """ Fixed-capacity ring buffer that can be registered as consumer-queue 
+        instead of a <queue.Queue>, when there is a single consumer of the 
+        sample-data. No locks are used: the producer only advances the head 
+        and the consumer only advances the tail. When the ring is full, newly
+        received sample-data is dropped and counted in num_dropped.
+        
+        Args:
+            capacity: <int> Maximum number of <SampleData>-objects in the ring.
+    """
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        self.num_dropped = 0
+    
+    def put(self, data):
+        """ Adds sample-data to the ring (called by the producer). """
+        head = self._head
+        if head - self._tail >= self._capacity:
+            self.num_dropped += 1
+            return
+        self._slots[head % self._capacity] = data
+        # Publish the slot only after it has been written
+        self._head = head + 1
+    
+    def get_nowait(self):
+        """ Removes and returns the oldest sample-data from the ring (called by
+            the consumer). Raises <queue.Empty> when the ring is empty.
+        """
+        tail = self._tail
+        if tail == self._head:
+            raise queue.Empty
+        idx = tail % self._capacity
+        data = self._slots[idx]
+        self._slots[idx] = None
+        self._tail = tail + 1
+        return data
+    
+    def qsize(self):
+        """ Returns the number of sample-data objects in the ring. """
+        return self._head - self._tail
+    
+    def empty(self):
+        """ Returns True when the ring contains no sample-data. """
+        return self._head == self._tail
+    
+    def task_done(self):
+        """ Present for compatibility with <queue.Queue>, the ring does not 
+            keep track of unfinished tasks.
+        """
+        pass
+
 def registerConsumer(id, q):
     """ Registers a consumer-queue to receive the sample-data of a specific
         device.
@@ -47,6 +103,7 @@ def registerConsumer(id, q):
                 must be put into the registered <queue>
 
             q: <queue> The queue into which received sample-data will be put.
+                Any object with a put()-method can be used, e.g. <SampleDataRing>.
     """
     settings._consumer_list.append(SampleDataConsumer(id, q))
 